@@ -58,6 +58,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -93,15 +94,30 @@ WSGI_APPLICATION = 'fyp.wsgi.application'
 DATABASE_URL = os.environ.get('DATABASE_URL')
 
 if DATABASE_URL:
-    # Production: Use PostgreSQL
+    # Production: Use PostgreSQL through psycopg 3's connection pool.
+    # Pooling replaces persistent connections, so CONN_MAX_AGE stays 0.
+    # Server-side binding lets psycopg prepare the hot statements (e.g. the
+    # access log INSERT) on each pooled connection. The pool keeps
+    # min_size connections open per worker and grows up to max_size under
+    # load (request threads plus the access log flusher).
+    # With health checks on, Django has the pool check each connection as
+    # it leaves the pool, so one dropped by the server is replaced instead
+    # of failing the request that gets it.
     DATABASES = {
         'default': dj_database_url.config(
             default=DATABASE_URL,
-            conn_max_age=600,
+            conn_max_age=0,
             conn_health_checks=True,
             ssl_require=True,
         )
     }
+    DATABASES['default']['OPTIONS'].update({
+        'pool': {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '4')),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '20')),
+        },
+        'server_side_binding': True,
+    })
 else:
     # Development: Use SQLite
     DATABASES = {
@@ -112,6 +128,27 @@ else:
     }
 
 
+# Cache
+# Redis when REDIS_URL is set (shared across workers), local memory otherwise.
+# Set it whenever more than one worker runs: the per-process cache keeps
+# known CIDs for a shorter time and does not cache unknown ones.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -155,11 +192,25 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Render events are buffered in-process and written in batches
+# (see tracker/utils/log_buffer.py)
+ACCESS_LOG_BATCH_SIZE = int(os.environ.get('ACCESS_LOG_BATCH_SIZE', '500'))
+ACCESS_LOG_FLUSH_INTERVAL = float(os.environ.get('ACCESS_LOG_FLUSH_INTERVAL', '1.0'))
+# Bound memory while the database is unreachable: events beyond
+# ACCESS_LOG_MAX_PENDING are dropped, and a row is given up after
+# ACCESS_LOG_MAX_REQUEUES failed flushes
+ACCESS_LOG_MAX_PENDING = int(os.environ.get('ACCESS_LOG_MAX_PENDING', '10000'))
+ACCESS_LOG_MAX_REQUEUES = int(os.environ.get('ACCESS_LOG_MAX_REQUEUES', '3'))
+
 # Django REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Set GENERATE_SCHEMA=False to skip the views' OpenAPI annotations;
+# /api/schema/ then falls back to what drf-spectacular can infer
+GENERATE_SCHEMA = os.environ.get('GENERATE_SCHEMA', 'True').lower() in ('true', '1', 'yes')
+
 # drf-spectacular settings
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Document Asset Tracker API',
@@ -1,17 +1,43 @@
 from django.contrib import admin
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
 from .models import Document, AccessLog
 
 
+def _is_changelist(request):
+    match = request.resolver_match
+    return match is not None and match.url_name.endswith('_changelist')
+
+
 @admin.register(Document)
 class DocumentAdmin(admin.ModelAdmin):
     list_display = ('cid', 'name', 'created_at', 'access_count')
     search_fields = ('cid', 'name')
     list_filter = ('created_at',)
     readonly_fields = ('created_at',)
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if _is_changelist(request):
+            # Skip the metadata JSON and other columns the list doesn't show
+            queryset = queryset.only('id', 'cid', 'name', 'created_at')
+        # A correlated subquery rather than a join, so the paginator's
+        # COUNT stays on the document table
+        access_logs = AccessLog.objects.filter(
+            document=OuterRef('pk')
+        ).order_by().values('document')
+        return queryset.annotate(
+            _access_count=Coalesce(
+                Subquery(access_logs.annotate(n=Count('id')).values('n')), 0
+            )
+        )
 
     def access_count(self, obj):
-        return obj.access_logs.count()
+        return obj._access_count
     access_count.short_description = 'Render Events'
+    access_count.admin_order_field = '_access_count'
 
 
 @admin.register(AccessLog)
@@ -33,6 +59,19 @@ class AccessLogAdmin(admin.ModelAdmin):
         'request_body', 'timestamp', 'clock_skew', 'is_first_access', 'session_id'
     )
     date_hierarchy = 'timestamp'
+    ordering = ('-timestamp',)
+    list_select_related = ('document',)
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related('document')
+        if _is_changelist(request):
+            # Only load the columns rendered in the changelist
+            queryset = queryset.only(
+                'id', 'endpoint', 'cid', 'ip_address', 'country',
+                'client_app', 'timestamp', 'is_first_access', 'document__cid'
+            )
+        return queryset
 
     def short_endpoint(self, obj):
         return obj.endpoint[:50] + '...' if len(obj.endpoint) > 50 else obj.endpoint
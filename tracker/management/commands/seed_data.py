@@ -22,9 +22,11 @@ class Command(BaseCommand):
         AccessLog.objects.all().delete()
         Document.objects.all().delete()
         
+        self.logs = []
         self.seed_investor_pitch()
         self.seed_leaked_memo()
         self.seed_proposal()
+        AccessLog.objects.bulk_create(self.logs, batch_size=500)
         
         self.stdout.write(self.style.SUCCESS('Successfully seeded data'))
 
@@ -33,7 +35,8 @@ class Command(BaseCommand):
         doc = Document.objects.create(
             cid=f"pitch-{uuid.uuid4().hex[:8]}",
             name="Series A Pitch Deck (Confidential)",
-            metadata={"type": "presentation", "version": "v3.1"}
+            metadata={"type": "presentation", "version": "v3.1"},
+            first_logged=True
         )
         
         # Locations: SF, NYC, London, Singapore
@@ -70,7 +73,8 @@ class Command(BaseCommand):
         doc = Document.objects.create(
             cid=f"memo-{uuid.uuid4().hex[:8]}",
             name="Internal Memo: 2026 Strategy",
-            metadata={"type": "pdf", "sensitivity": "high"}
+            metadata={"type": "pdf", "sensitivity": "high"},
+            first_logged=True
         )
         
         base_time = timezone.now() - timedelta(days=2)
@@ -103,7 +107,8 @@ class Command(BaseCommand):
         doc = Document.objects.create(
             cid=f"prop-{uuid.uuid4().hex[:8]}",
             name="Enterprise License Proposal - Acme Corp",
-            metadata={"client": "Acme Corp"}
+            metadata={"client": "Acme Corp"},
+            first_logged=True
         )
         
         base_time = timezone.now() - timedelta(days=14)
@@ -130,7 +135,7 @@ class Command(BaseCommand):
         if not ip:
             ip = f"{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}"
             
-        AccessLog.objects.create(
+        self.logs.append(AccessLog(
             document=doc,
             cid=doc.cid,
             timestamp=timestamp,
@@ -146,4 +151,4 @@ class Command(BaseCommand):
             endpoint=f"/assets/media/logo.png",
             method="GET",
             is_first_access=random.random() < 0.3
-        )
+        ))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-15 04:50
+
+from django.db import migrations, models
+
+
+def backfill_first_logged(apps, schema_editor):
+    Document = apps.get_model('tracker', 'Document')
+    Document.objects.filter(access_logs__isnull=False).update(first_logged=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0002_document_file_path_alter_accesslog_timestamp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='first_logged',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_first_logged, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 04:53
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0004_alter_accesslog_cid_alter_accesslog_document_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='accesslog',
+            options={'verbose_name': 'Document Render Event', 'verbose_name_plural': 'Document Render Events'},
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0005_alter_accesslog_options'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accesslog',
+            index=models.Index(condition=models.Q(('country', ''), _negated=True), fields=['country'], name='al_country_nonempty'),
+        ),
+        migrations.AddIndex(
+            model_name='accesslog',
+            index=models.Index(condition=models.Q(('client_app', ''), _negated=True), fields=['client_app'], name='al_client_app_nonempty'),
+        ),
+    ]
@@ -11,6 +11,7 @@ class Document(models.Model):
     file_path = models.CharField(max_length=500, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     metadata = models.JSONField(default=dict, blank=True)
+    first_logged = models.BooleanField(default=False)
 
     class Meta:
         verbose_name = "Document Asset"
@@ -20,10 +21,9 @@ class Document(models.Model):
         return f"{self.cid} - {self.name or 'Unnamed'}"
 
     @classmethod
-    def get_or_create_by_cid(cls, cid):
-        """Get or create a document by CID."""
-        doc, _ = cls.objects.get_or_create(cid=cid)
-        return doc
+    def mark_first_logged(cls, pk):
+        """Flag a document as logged; True only for the call that flipped it."""
+        return cls.objects.filter(pk=pk, first_logged=False).update(first_logged=True) == 1
 
 
 class AccessLog(models.Model):
@@ -33,9 +33,10 @@ class AccessLog(models.Model):
         on_delete=models.CASCADE,
         related_name='access_logs',
         null=True,
-        blank=True
+        blank=True,
+        db_index=False,  # covered by the (document, -timestamp) index
     )
-    cid = models.CharField(max_length=64, db_index=True, blank=True)
+    cid = models.CharField(max_length=64, blank=True)
 
     # Network layer
     ip_address = models.GenericIPAddressField(null=True, blank=True)
@@ -77,10 +78,21 @@ class AccessLog(models.Model):
     class Meta:
         verbose_name = "Document Render Event"
         verbose_name_plural = "Document Render Events"
-        ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['cid', 'timestamp']),
             models.Index(fields=['ip_address', 'timestamp']),
+            models.Index(fields=['document', '-timestamp'], name='al_doc_ts_desc'),
+            # Dashboard breakdowns skip rows without a value
+            models.Index(
+                fields=['country'],
+                condition=~models.Q(country=''),
+                name='al_country_nonempty',
+            ),
+            models.Index(
+                fields=['client_app'],
+                condition=~models.Q(client_app=''),
+                name='al_client_app_nonempty',
+            ),
         ]
 
     def __str__(self):
@@ -0,0 +1,24 @@
+"""
+Model signal handlers.
+Keep the known-CID cache in step with documents edited outside the API
+(e.g. through the admin).
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Document
+from .utils.cid_cache import forget_cid, remember_cids
+
+
+@receiver(post_save, sender=Document)
+def remember_saved_document(sender, instance, **kwargs):
+    cid = instance.cid
+    transaction.on_commit(lambda: remember_cids([cid]))
+
+
+@receiver(post_delete, sender=Document)
+def forget_deleted_document(sender, instance, **kwargs):
+    # After commit, so a concurrent lookup can't re-cache the row first
+    cid = instance.cid
+    transaction.on_commit(lambda: forget_cid(cid))
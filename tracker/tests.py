@@ -1,3 +1,568 @@
-from django.test import TestCase
+import queue
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import AccessLog, Document
+from .utils import cid_cache, log_buffer
+from .utils.cid_cache import is_known_cid, remember_cids
+from .utils.logging import log_access, log_telemetry
+from .views.api import _save_documents
+
+
+class DocumentAdminTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        logged = Document.objects.create(cid='doc-1')
+        Document.objects.create(cid='doc-2')
+        AccessLog.objects.bulk_create(
+            AccessLog(document=logged, cid='doc-1', endpoint='/api/beacon')
+            for _ in range(3)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_changelist_shows_access_counts(self):
+        response = self.client.get('/admin/tracker/document/')
+
+        self.assertEqual(response.status_code, 200)
+        counts = {
+            document.cid: document._access_count
+            for document in response.context['cl'].result_list
+        }
+        self.assertEqual(counts, {'doc-1': 3, 'doc-2': 0})
+
+    def test_changelist_count_skips_access_logs(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/admin/tracker/document/')
+
+        counts = [q['sql'] for q in queries if 'COUNT(*)' in q['sql']]
+        self.assertTrue(counts)
+        for sql in counts:
+            self.assertNotIn('tracker_accesslog', sql)
+
+
+class BufferedLoggingTestCase(TestCase):
+    """Logs through the buffer without the flusher thread; tests flush()."""
+
+    def setUp(self):
+        patcher = mock.patch.object(log_buffer, '_ensure_worker')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.drain)
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def drain(self):
+        log_buffer._retry = []
+        while True:
+            try:
+                log_buffer._pending.get_nowait()
+            except queue.Empty:
+                return
+
+    def log(self, cid, endpoint='/assets/media/logo.png', **extra):
+        return log_access(self.factory.get(endpoint, **extra), endpoint, cid=cid)
+
+
+class StopFlusher(BaseException):
+    pass
+
+
+class LogBufferTests(BufferedLoggingTestCase):
+
+    def test_flush_writes_queued_events(self):
+        self.log('doc-1')
+        self.log('doc-2')
+
+        self.assertEqual(log_buffer.flush(), 2)
+        self.assertEqual(log_buffer.flush(), 0)
+        self.assertEqual(AccessLog.objects.count(), 2)
+
+    def test_first_access_flagged_once_across_batches(self):
+        document = Document.objects.create(cid='doc-1')
+
+        first = self.log('doc-1')
+        second = self.log('doc-1')
+        self.assertEqual(log_buffer.flush(), 2)
+        third = self.log('doc-1')
+        self.assertEqual(log_buffer.flush(), 1)
+
+        flagged = AccessLog.objects.filter(is_first_access=True)
+        self.assertEqual(list(flagged.values_list('pk', flat=True)), [first.pk])
+        self.assertFalse(AccessLog.objects.get(pk=second.pk).is_first_access)
+        self.assertFalse(AccessLog.objects.get(pk=third.pk).is_first_access)
+        document.refresh_from_db()
+        self.assertTrue(document.first_logged)
+
+    def test_unknown_cid_creates_document(self):
+        access_log = self.log('new-doc')
+
+        with self.assertNumQueries(0):
+            self.log('new-doc')
+        log_buffer.flush()
+
+        document = Document.objects.get(cid='new-doc')
+        saved = AccessLog.objects.get(pk=access_log.pk)
+        self.assertEqual(saved.document, document)
+        self.assertTrue(saved.is_first_access)
+
+    def test_failed_row_leaves_first_access_unset(self):
+        document = Document.objects.create(cid='doc-1')
+        bad = self.log('doc-1', '/assets/media/bad.png')
+        bad.timestamp = 'not a timestamp'
+        self.log('doc-1', '/assets/media/good.png')
+
+        with self.assertLogs(log_buffer.logger, 'ERROR'):
+            self.assertEqual(log_buffer.flush(), 1)
+
+        # The failed row's flag rolled back, so the next event gets it
+        good = AccessLog.objects.get(endpoint='/assets/media/good.png')
+        self.assertTrue(good.is_first_access)
+        self.assertEqual(good.document, document)
+
+    def test_bad_row_only_loses_itself(self):
+        bad = self.log('doc-1', '/assets/media/bad.png')
+        bad.timestamp = 'not a timestamp'
+        self.log('doc-1', '/assets/media/good.png')
+        self.log('doc-2')
+
+        with self.assertLogs(log_buffer.logger, 'ERROR'):
+            self.assertEqual(log_buffer.flush(), 2)
+        self.assertFalse(AccessLog.objects.filter(endpoint='/assets/media/bad.png').exists())
+        self.assertTrue(AccessLog.objects.filter(endpoint='/assets/media/good.png').exists())
+
+    def test_operational_error_keeps_batch_for_next_flush(self):
+        self.log('doc-1')
+        self.log('doc-1')
+
+        with mock.patch.object(
+            AccessLog.objects, 'bulk_create', side_effect=OperationalError
+        ), self.assertLogs(log_buffer.logger, 'ERROR'):
+            self.assertEqual(log_buffer.flush(), 0)
+
+        self.assertEqual(log_buffer.flush(), 2)
+        self.assertEqual(AccessLog.objects.count(), 2)
+        self.assertEqual(AccessLog.objects.filter(is_first_access=True).count(), 1)
+
+    def test_rows_are_dropped_after_max_requeues(self):
+        self.log('doc-1')
+
+        with self.settings(ACCESS_LOG_MAX_REQUEUES=1), mock.patch.object(
+            AccessLog.objects, 'bulk_create', side_effect=OperationalError
+        ), self.assertLogs(log_buffer.logger) as logs:
+            log_buffer.flush()
+            log_buffer.flush()
+
+        self.assertIn('Dropped 1 render events', logs.output[-1])
+        self.assertEqual(log_buffer.flush(), 0)
+
+    def test_full_buffer_drops_new_events(self):
+        with mock.patch.object(log_buffer, '_pending', queue.Queue(maxsize=1)):
+            self.log('doc-1')
+            self.log('doc-1')
+
+            with self.assertLogs(log_buffer.logger, 'WARNING') as logs:
+                self.assertEqual(log_buffer.flush(), 1)
+        self.assertIn('dropped 1 events', logs.output[0])
+
+    def test_flusher_survives_a_failed_flush(self):
+        flush = mock.Mock(side_effect=[RuntimeError, StopFlusher])
+        with mock.patch.object(log_buffer, 'flush', flush), mock.patch.object(
+            log_buffer._wake, 'wait'
+        ), self.assertLogs(log_buffer.logger, 'ERROR'):
+            with self.assertRaises(StopFlusher):
+                log_buffer._run()
+        self.assertEqual(flush.call_count, 2)
+
+    def test_client_values_fit_their_columns(self):
+        access_log = self.log(
+            'x' * 65,
+            '/assets/media/' + 'a' * 300,
+            HTTP_X_FORWARDED_FOR='unknown',
+            HTTP_ACCEPT_LANGUAGE='en-US,' * 50,
+        )
+        self.assertEqual(access_log.cid, '')
+        self.assertIsNone(access_log.ip_address)
+        self.assertEqual(len(access_log.accept_language), 128)
+        self.assertEqual(len(access_log.endpoint), 255)
+
+        telemetry = log_telemetry(
+            self.factory.post('/telemetry/client'),
+            '/telemetry/client',
+            {'client': {'name': 'Word'}, 'build': '1' * 100},
+        )
+        self.assertEqual(telemetry.client_app, '')
+        self.assertEqual(len(telemetry.client_build), 64)
+
+        self.assertEqual(log_buffer.flush(), 2)
+        self.assertFalse(Document.objects.exists())
+
+    def test_nul_characters_are_stripped_from_json(self):
+        access_log = log_telemetry(
+            self.factory.post('/telemetry/events?x=a%00b'),
+            '/telemetry/events',
+            {'events': [{'na\x00me': 'va\x00lue'}]},
+        )
+
+        self.assertEqual(access_log.query_params, {'x': 'ab'})
+        self.assertEqual(access_log.request_body, {'events': [{'name': 'value'}]})
+
+
+class CidCacheTests(BufferedLoggingTestCase):
+
+    def test_known_cid_is_cached(self):
+        Document.objects.create(cid='doc-1')
+
+        with self.assertNumQueries(1):
+            self.assertTrue(is_known_cid('doc-1'))
+        with self.assertNumQueries(0):
+            self.assertTrue(is_known_cid('doc-1'))
+
+    def test_unknown_cid_is_not_cached_per_process(self):
+        self.assertFalse(cid_cache._is_shared())
+
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.assertFalse(is_known_cid('doc-1'))
+
+    def test_shared_cache_keeps_unknown_cids(self):
+        with tempfile.TemporaryDirectory() as location, self.settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': location,
+            },
+        }):
+            self.assertTrue(cid_cache._is_shared())
+            with self.assertNumQueries(1):
+                self.assertFalse(is_known_cid('doc-1'))
+            with self.assertNumQueries(0):
+                self.assertFalse(is_known_cid('doc-1'))
+
+    def test_font_views_check_cids_through_the_cache(self):
+        Document.objects.create(cid='doc-1')
+        self.client.get('/fonts/body.woff2', {'resource_id': 'doc-1'})
+
+        with self.assertNumQueries(0):
+            self.client.get('/themes/light.css', {'resource_id': 'doc-1'})
+        self.assertEqual(log_buffer.flush(), 2)
+
+    def test_flushed_documents_are_known_after_commit(self):
+        self.log('new-doc')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            log_buffer.flush()
+
+        with self.assertNumQueries(0):
+            self.assertTrue(is_known_cid('new-doc'))
+
+    def test_saved_documents_are_remembered(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Document.objects.create(cid='doc-1')
+
+        with self.assertNumQueries(0):
+            self.assertTrue(is_known_cid('doc-1'))
+
+    def test_deleted_documents_are_forgotten(self):
+        document = Document.objects.create(cid='doc-1')
+        self.assertTrue(is_known_cid('doc-1'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            document.delete()
+
+        self.assertFalse(is_known_cid('doc-1'))
+
+    def test_remembered_cids_skip_the_database(self):
+        remember_cids(['doc-1'])
+
+        with self.assertNumQueries(0):
+            self.assertTrue(is_known_cid('doc-1'))
+
+    def test_registered_documents_are_known_at_once(self):
+        response = self.client.post(
+            '/api/documents/create', {'uuid': 'doc-1'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/beacon', {'resource_id': 'doc-1'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_numeric_uuid_is_registered_as_a_string(self):
+        for _ in range(2):
+            response = self.client.post(
+                '/api/documents/create', {'uuid': 123}, content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['resource_id'], '123')
+
+        response = self.client.post(
+            '/api/documents/create', [{'uuid': 123}], content_type='application/json'
+        )
+        self.assertEqual(response.json()['resource_ids'], ['123'])
+
+        self.assertEqual(list(Document.objects.values_list('cid', flat=True)), ['123'])
+        self.assertTrue(is_known_cid('123'))
+
+
+class DashboardIndexTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        AccessLog.objects.bulk_create([
+            AccessLog(
+                endpoint='/a', ip_address='10.0.0.1',
+                client_app='Microsoft Word', user_agent='Word/16.0',
+            ),
+            AccessLog(
+                endpoint='/a', ip_address='10.0.0.1',
+                client_app='Microsoft Excel', user_agent='iPhone',
+            ),
+            AccessLog(
+                endpoint='/a', ip_address='10.0.0.2',
+                user_agent='Mozilla/5.0 (Linux; Android 14)',
+            ),
+            AccessLog(
+                endpoint='/a', ip_address='10.0.0.3',
+                user_agent='Mozilla/5.0 (iPad; CPU OS 17_0)',
+            ),
+            AccessLog(
+                endpoint='/a', ip_address='10.0.0.4',
+                user_agent='Mozilla/5.0 (Windows NT 10.0) Chrome/120.0',
+                timestamp=now - timedelta(days=3),
+            ),
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_device_categories(self):
+        response = self.client.get('/dashboard/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context['device_stats'],
+            {'mobile': 2, 'desktop': 1, 'office': 2},
+        )
+
+    def test_overview_counts(self):
+        response = self.client.get('/dashboard/')
+
+        context = response.context
+        self.assertEqual(context['total_events'], 5)
+        self.assertEqual(context['events_24h'], 4)
+        self.assertEqual(context['events_7d'], 5)
+        self.assertEqual(context['unique_ips'], 4)
+        self.assertEqual(context['unique_ips_24h'], 3)
+
+
+class EventsListPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        # Pairs of events share a timestamp so the id tie-break matters
+        AccessLog.objects.bulk_create(
+            AccessLog(
+                endpoint=f'/assets/media/{i}.png',
+                timestamp=now - timedelta(seconds=i // 2),
+            )
+            for i in range(120)
+        )
+        cls.expected = list(
+            AccessLog.objects.order_by('-timestamp', '-id').values_list('id', flat=True)
+        )
+
+    def page(self, **params):
+        response = self.client.get('/dashboard/events/', params)
+        self.assertEqual(response.status_code, 200)
+        return [e.id for e in response.context['events']], response.context['pagination']
+
+    def test_cursor_walks_every_event_once(self):
+        seen, pagination = self.page()
+        pages = [pagination]
+        while pagination['next_cursor']:
+            ids, pagination = self.page(cursor=pagination['next_cursor'])
+            seen += ids
+            pages.append(pagination)
+
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(pages[0]['prev_cursor'], '')
+
+    def test_before_returns_previous_page(self):
+        first, pagination = self.page()
+        second, pagination = self.page(cursor=pagination['next_cursor'])
+
+        back, pagination = self.page(before=pagination['prev_cursor'])
+        self.assertEqual(back, first)
+        self.assertEqual(second, self.expected[50:100])
+
+    def test_invalid_cursor_starts_from_newest(self):
+        ids, _ = self.page(cursor='garbage')
+        self.assertEqual(ids, self.expected[:50])
+
+
+class ConditionalResponseTests(BufferedLoggingTestCase):
+    endpoints = (
+        '/assets/media/logo.png',
+        '/assets/static/img/spacer.gif',
+        '/fonts/body.woff2',
+        '/themes/light.css',
+        '/config/runtime.json',
+        '/config/ui-flags.json',
+        '/config/doc-settings.json',
+    )
+
+    def test_if_none_match_returns_not_modified(self):
+        for url in self.endpoints:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+                cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(cached.status_code, 304)
+                self.assertEqual(cached.content, b'')
+                self.assertEqual(cached['ETag'], response['ETag'])
+
+                stale = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+                self.assertEqual(stale.status_code, 200)
+
+    def test_not_modified_pixel_is_still_logged(self):
+        Document.objects.create(cid='doc-1')
+        etag = self.client.get('/assets/media/logo.png')['ETag']
+
+        response = self.client.get(
+            '/assets/media/logo.png?resource_id=doc-1', HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(log_buffer.flush(), 1)
+
+    def test_config_etag_tracks_the_body(self):
+        runtime = self.client.get('/config/runtime.json')
+        ui_flags = self.client.get('/config/ui-flags.json')
+
+        self.assertEqual(runtime.json()['theme'], 'light')
+        self.assertNotEqual(runtime['ETag'], ui_flags['ETag'])
+        self.assertEqual(
+            self.client.get(
+                '/config/runtime.json', HTTP_IF_NONE_MATCH=ui_flags['ETag']
+            ).status_code,
+            200,
+        )
+
+    def test_head_matches_get_without_body(self):
+        for url in self.endpoints:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                head = self.client.head(url)
+                self.assertEqual(head.status_code, 200)
+                self.assertEqual(head.content, b'')
+                self.assertEqual(head['Content-Type'], response['Content-Type'])
+                self.assertEqual(int(head['Content-Length']), len(response.content))
+                self.assertEqual(head['ETag'], response['ETag'])
+
+    def test_head_is_not_a_render_event(self):
+        Document.objects.create(cid='doc-1')
+
+        self.client.head('/assets/media/logo.png?resource_id=doc-1')
+        self.client.head('/assets/static/img/spacer.gif?resource_id=doc-1')
+        self.client.head('/fonts/body.woff2?resource_id=doc-1')
+        self.client.head('/themes/light.css?resource_id=doc-1')
+        self.client.head('/config/runtime.json?cid=doc-1')
+        self.client.head('/health/ping?cid=doc-1')
+        self.assertEqual(log_buffer.flush(), 0)
+
+        self.client.get('/assets/media/logo.png?resource_id=doc-1')
+        self.assertEqual(log_buffer.flush(), 1)
+
+    def test_theme_etag_varies_by_theme(self):
+        light = self.client.get('/themes/light.css')
+        dark = self.client.get('/themes/dark.css')
+
+        self.assertIn(b'--theme: dark', dark.content)
+        self.assertNotEqual(light['ETag'], dark['ETag'])
+        self.assertEqual(int(dark['Content-Length']), len(dark.content))
+
+    def test_head_health_checks_match_get(self):
+        for url in ('/health/ping', '/status/ready', '/prefetch/init'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                head = self.client.head(url)
+                self.assertEqual(head.status_code, 200)
+                self.assertEqual(head['Content-Type'], response['Content-Type'])
+                self.assertEqual(int(head['Content-Length']), len(response.content))
+
+
+class SaveDocumentsTests(TestCase):
+
+    def test_unchanged_documents_are_skipped(self):
+        Document.objects.create(cid='doc-1', name='Report', file_path='a.docx')
+
+        with self.assertNumQueries(1):
+            _save_documents({
+                'doc-1': Document(cid='doc-1', name='Report', file_path='a.docx'),
+            })
+
+    def test_new_and_changed_documents_are_written(self):
+        Document.objects.create(cid='doc-1', name='Report', file_path='a.docx')
+
+        _save_documents({
+            'doc-1': Document(cid='doc-1', name='Renamed', file_path='a.docx'),
+            'doc-2': Document(cid='doc-2', name='Other'),
+        })
+
+        self.assertEqual(
+            list(Document.objects.order_by('cid').values_list('cid', 'name')),
+            [('doc-1', 'Renamed'), ('doc-2', 'Other')],
+        )
+
+    def test_repeated_numeric_uuid_costs_one_query(self):
+        payload = {'uuid': 123, 'document_name': 'Report'}
+        self.client.post('/api/documents/create', payload, content_type='application/json')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                '/api/documents/create', payload, content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+
+
+class DocumentsListTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_documents_are_annotated_with_their_events(self):
+        now = timezone.now()
+        busy = Document.objects.create(cid='doc-1')
+        Document.objects.create(cid='doc-2')
+        AccessLog.objects.bulk_create([
+            AccessLog(document=busy, endpoint='/a', timestamp=now - timedelta(hours=2)),
+            AccessLog(document=busy, endpoint='/a', timestamp=now - timedelta(hours=1)),
+            AccessLog(document=busy, endpoint='/a', timestamp=now),
+        ])
+
+        response = self.client.get('/dashboard/documents/')
+
+        self.assertEqual(response.status_code, 200)
+        documents = list(response.context['documents'])
+        self.assertEqual([d.cid for d in documents], ['doc-1', 'doc-2'])
+        self.assertEqual(documents[0].event_count, 3)
+        self.assertEqual(documents[0].first_access, now - timedelta(hours=2))
+        self.assertEqual(documents[0].last_access, now)
+        self.assertEqual(documents[1].event_count, 0)
+        self.assertIsNone(documents[1].first_access)
+        self.assertIsNone(documents[1].last_access)
@@ -2,7 +2,7 @@
 URL configuration for tracker app.
 All routes designed to look like normal SaaS traffic.
 """
-from django.urls import path, re_path
+from django.urls import path
 from django.views.generic import RedirectView
 
 from .views import assets, config, telemetry, fonts, health, dashboard, api
@@ -26,8 +26,8 @@ urlpatterns = [
     path('api/beacon', api.beacon, name='api_beacon'),
 
     # Asset retrieval endpoints
-    re_path(r'^assets/media/(?P<filename>.+)$', assets.media_asset, name='media_asset'),
-    re_path(r'^assets/static/(?P<path>.+)$', assets.static_asset, name='static_asset'),
+    path('assets/media/<path:filename>', assets.media_asset, name='media_asset'),
+    path('assets/static/<path:path>', assets.static_asset, name='static_asset'),
     
     # Configuration endpoints
     path('config/runtime.json', config.runtime_config, name='runtime_config'),
@@ -40,8 +40,8 @@ urlpatterns = [
     path('telemetry/events', telemetry.events, name='telemetry_events'),
     
     # Font and theme endpoints
-    re_path(r'^fonts/(?P<fontname>.+\.woff2?)$', fonts.font_file, name='font_file'),
-    re_path(r'^themes/(?P<themename>.+\.css)$', fonts.theme_file, name='theme_file'),
+    path('fonts/<path:fontname>', fonts.font_file, name='font_file'),
+    path('themes/<path:themename>', fonts.theme_file, name='theme_file'),
     
     # Health and prefetch endpoints
     path('health/ping', health.ping, name='health_ping'),
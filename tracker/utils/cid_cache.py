@@ -0,0 +1,53 @@
+"""
+Known-CID lookups backed by Django's cache.
+Keeps document existence checks off the database on the tracking hot path.
+"""
+import hashlib
+from typing import Iterable
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+CACHE_TIMEOUT = 300  # seconds
+# Unknown CIDs are cached briefly so probes don't each hit the database,
+# while documents registered elsewhere still show up quickly.
+NEGATIVE_CACHE_TIMEOUT = 30  # seconds
+# A per-process cache never sees other workers' creates and deletes, so
+# without a shared backend known CIDs expire sooner and misses aren't kept.
+LOCAL_CACHE_TIMEOUT = 30  # seconds
+
+
+def _is_shared() -> bool:
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def _cache_key(cid: str) -> str:
+    # CIDs come straight from query strings; hash them into a safe key
+    return 'doc:cid:' + hashlib.md5(cid.encode(), usedforsecurity=False).hexdigest()
+
+
+def is_known_cid(cid: str) -> bool:
+    """Return True if a Document with this CID exists."""
+    from ..models import Document
+
+    key = _cache_key(cid)
+    known = cache.get(key)
+    if known is None:
+        known = Document.objects.filter(cid=cid).exists()
+        if _is_shared():
+            cache.set(key, known, CACHE_TIMEOUT if known else NEGATIVE_CACHE_TIMEOUT)
+        elif known:
+            cache.set(key, known, LOCAL_CACHE_TIMEOUT)
+    return known
+
+
+def remember_cids(cids: Iterable[str]) -> None:
+    """Mark CIDs as known, e.g. right after their documents are registered."""
+    timeout = CACHE_TIMEOUT if _is_shared() else LOCAL_CACHE_TIMEOUT
+    cache.set_many({_cache_key(cid): True for cid in cids}, timeout)
+
+
+def forget_cid(cid: str) -> None:
+    """Drop a cached CID, e.g. after its document is deleted."""
+    cache.delete(_cache_key(cid))
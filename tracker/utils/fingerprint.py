@@ -2,23 +2,43 @@
 Fingerprinting utilities for extracting client information.
 Designed to blend into normal request handling.
 """
+import functools
 import re
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 
 
 def get_client_ip(request) -> Optional[str]:
     """Extract real IP address, handling proxies."""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    meta = request.META
+    x_forwarded_for = meta.get('HTTP_X_FORWARDED_FOR')
     if x_forwarded_for:
-        return x_forwarded_for.split(',')[0].strip()
-    x_real_ip = request.META.get('HTTP_X_REAL_IP')
-    if x_real_ip:
-        return x_real_ip
-    return request.META.get('REMOTE_ADDR')
-
-
-def parse_user_agent(ua_string: str) -> Dict[str, str]:
-    """Parse User-Agent for OS and browser information."""
+        # First hop only; slicing avoids building a list for every request
+        comma = x_forwarded_for.find(',')
+        return (x_forwarded_for[:comma] if comma >= 0 else x_forwarded_for).strip()
+    return meta.get('HTTP_X_REAL_IP') or meta.get('REMOTE_ADDR')
+
+
+# User-Agent patterns, compiled once and only run after a cheap substring check
+_OFFICE_RE = re.compile(r'Microsoft Office\s+([\w\s]+)', re.I)
+_WORD_RE = re.compile(r'Word[/\s]*([\d.]+)?', re.I)
+_EXCEL_RE = re.compile(r'Excel[/\s]*([\d.]+)?', re.I)
+_MAC_VERSION_RE = re.compile(r'Mac OS X ([\d_]+)')
+_ANDROID_VERSION_RE = re.compile(r'Android ([\d.]+)')
+_IOS_VERSION_RE = re.compile(r'OS ([\d_]+)')
+_CHROME_VERSION_RE = re.compile(r'Chrome/([\d.]+)')
+_EDGE_VERSION_RE = re.compile(r'Edg/([\d.]+)')
+_FIREFOX_VERSION_RE = re.compile(r'Firefox/([\d.]+)')
+_SAFARI_VERSION_RE = re.compile(r'Version/([\d.]+)')
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_user_agent(ua_string: str) -> Mapping[str, str]:
+    """
+    Parse User-Agent for OS and browser information.
+
+    Results are cached per UA string and returned read-only.
+    """
     result = {
         'os_name': '',
         'os_version': '',
@@ -29,24 +49,28 @@ def parse_user_agent(ua_string: str) -> Dict[str, str]:
     }
 
     if not ua_string:
-        return result
-
-    # Detect Office applications
-    office_match = re.search(r'Microsoft Office\s+([\w\s]+)', ua_string, re.I)
-    if office_match:
-        result['client_app'] = f"Microsoft Office {office_match.group(1)}"
-
-    word_match = re.search(r'Word[/\s]*([\d.]+)?', ua_string, re.I)
-    if word_match:
-        result['client_app'] = 'Microsoft Word'
-        if word_match.group(1):
-            result['client_build'] = word_match.group(1)
-
-    excel_match = re.search(r'Excel[/\s]*([\d.]+)?', ua_string, re.I)
-    if excel_match:
-        result['client_app'] = 'Microsoft Excel'
-        if excel_match.group(1):
-            result['client_build'] = excel_match.group(1)
+        return MappingProxyType(result)
+
+    # Detect Office applications (case-insensitive)
+    ua_lower = ua_string.lower()
+    if 'microsoft office' in ua_lower:
+        office_match = _OFFICE_RE.search(ua_string)
+        if office_match:
+            result['client_app'] = f"Microsoft Office {office_match.group(1)}"
+
+    if 'word' in ua_lower:
+        word_match = _WORD_RE.search(ua_string)
+        if word_match:
+            result['client_app'] = 'Microsoft Word'
+            if word_match.group(1):
+                result['client_build'] = word_match.group(1)
+
+    if 'excel' in ua_lower:
+        excel_match = _EXCEL_RE.search(ua_string)
+        if excel_match:
+            result['client_app'] = 'Microsoft Excel'
+            if excel_match.group(1):
+                result['client_build'] = excel_match.group(1)
 
     # Detect OS
     if 'Windows NT 10' in ua_string:
@@ -60,46 +84,51 @@ def parse_user_agent(ua_string: str) -> Dict[str, str]:
         result['os_version'] = '7'
     elif 'Mac OS X' in ua_string:
         result['os_name'] = 'macOS'
-        mac_ver = re.search(r'Mac OS X ([\d_]+)', ua_string)
+        mac_ver = _MAC_VERSION_RE.search(ua_string)
         if mac_ver:
             result['os_version'] = mac_ver.group(1).replace('_', '.')
     elif 'Linux' in ua_string:
         result['os_name'] = 'Linux'
     elif 'Android' in ua_string:
         result['os_name'] = 'Android'
-        android_ver = re.search(r'Android ([\d.]+)', ua_string)
+        android_ver = _ANDROID_VERSION_RE.search(ua_string)
         if android_ver:
             result['os_version'] = android_ver.group(1)
     elif 'iPhone' in ua_string or 'iPad' in ua_string:
         result['os_name'] = 'iOS'
-        ios_ver = re.search(r'OS ([\d_]+)', ua_string)
+        ios_ver = _IOS_VERSION_RE.search(ua_string)
         if ios_ver:
             result['os_version'] = ios_ver.group(1).replace('_', '.')
 
     # Detect browsers (if not Office)
     if not result['client_app']:
-        if 'Chrome' in ua_string and 'Edg' not in ua_string:
-            result['browser_name'] = 'Chrome'
-            chrome_ver = re.search(r'Chrome/([\d.]+)', ua_string)
-            if chrome_ver:
-                result['browser_version'] = chrome_ver.group(1)
-        elif 'Edg' in ua_string:
+        if 'Edg' in ua_string:
             result['browser_name'] = 'Edge'
-            edge_ver = re.search(r'Edg/([\d.]+)', ua_string)
+            edge_ver = _EDGE_VERSION_RE.search(ua_string)
             if edge_ver:
                 result['browser_version'] = edge_ver.group(1)
+        elif 'Chrome' in ua_string:
+            result['browser_name'] = 'Chrome'
+            chrome_ver = _CHROME_VERSION_RE.search(ua_string)
+            if chrome_ver:
+                result['browser_version'] = chrome_ver.group(1)
         elif 'Firefox' in ua_string:
             result['browser_name'] = 'Firefox'
-            ff_ver = re.search(r'Firefox/([\d.]+)', ua_string)
+            ff_ver = _FIREFOX_VERSION_RE.search(ua_string)
             if ff_ver:
                 result['browser_version'] = ff_ver.group(1)
         elif 'Safari' in ua_string:
             result['browser_name'] = 'Safari'
-            safari_ver = re.search(r'Version/([\d.]+)', ua_string)
+            safari_ver = _SAFARI_VERSION_RE.search(ua_string)
             if safari_ver:
                 result['browser_version'] = safari_ver.group(1)
 
-    return result
+    return MappingProxyType(result)
+
+
+def ua_cache_info():
+    """Hit/miss statistics for the User-Agent parse cache."""
+    return parse_user_agent.cache_info()
 
 
 def extract_request_metadata(request) -> Dict[str, Any]:
@@ -107,6 +136,7 @@ def extract_request_metadata(request) -> Dict[str, Any]:
     ua_string = request.META.get('HTTP_USER_AGENT', '')
     ua_data = parse_user_agent(ua_string)
 
+    # ua_data is shared by the parse cache; spreading it copies the values
     return {
         'ip_address': get_client_ip(request),
         'user_agent': ua_string,
@@ -119,3 +149,9 @@ def extract_request_metadata(request) -> Dict[str, Any]:
 def extract_query_params(request) -> Dict[str, str]:
     """Extract query parameters from request."""
     return {k: v for k, v in request.GET.items()}
+
+
+def extract_cid(request) -> Optional[str]:
+    """Return the tracking CID from ?cid=, falling back to ?c=."""
+    params = request.GET
+    return params.get('cid') or params.get('c')
@@ -0,0 +1,195 @@
+"""
+Buffered writer for render events.
+Keeps AccessLog inserts off the request path by batching them.
+"""
+import atexit
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, transaction
+
+from .cid_cache import remember_cids
+
+
+logger = logging.getLogger(__name__)
+
+_pending = queue.Queue(maxsize=settings.ACCESS_LOG_MAX_PENDING)
+_retry = []  # rows from a flush the database refused, written first next time
+_dropped = 0
+_dropped_lock = threading.Lock()
+_wake = threading.Event()
+_flush_lock = threading.Lock()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def enqueue(access_log) -> None:
+    """Queue an unsaved AccessLog for the next batch insert."""
+    global _dropped
+    _ensure_worker()
+    try:
+        _pending.put_nowait(access_log)
+    except queue.Full:
+        with _dropped_lock:
+            _dropped += 1
+        return
+    if _pending.qsize() >= settings.ACCESS_LOG_BATCH_SIZE:
+        _wake.set()
+
+
+def flush() -> int:
+    """Write every queued render event. Returns the number of rows written."""
+    global _dropped, _retry
+
+    with _flush_lock:
+        batch, _retry = _retry, []
+        while True:
+            try:
+                batch.append(_pending.get_nowait())
+            except queue.Empty:
+                break
+        with _dropped_lock:
+            dropped, _dropped = _dropped, 0
+        if dropped:
+            logger.warning("Render event buffer full; dropped %d events", dropped)
+        if not batch:
+            return 0
+
+        try:
+            close_old_connections()
+            _write(batch)
+        except OperationalError:
+            # The database is unreachable, not the rows bad; try again later
+            logger.exception("Failed to write %d render events", len(batch))
+            _hold(batch)
+            return 0
+        except Exception:
+            logger.exception(
+                "Failed to write %d render events; retrying one by one",
+                len(batch),
+            )
+            return _write_each(batch)
+        return len(batch)
+
+
+def _write(batch) -> None:
+    from ..models import AccessLog
+
+    # first_logged and new documents only commit together with the rows.
+    # As a savepoint, a failure also leaves any outer transaction usable
+    # for the row-by-row retry.
+    with transaction.atomic():
+        _link_documents(batch)
+        AccessLog.objects.bulk_create(
+            batch, batch_size=settings.ACCESS_LOG_BATCH_SIZE
+        )
+
+
+def _write_each(batch) -> int:
+    """Insert rows one at a time so a bad row only loses itself."""
+    written = 0
+    for index, access_log in enumerate(batch):
+        _reset(access_log)
+        try:
+            _write([access_log])
+        except OperationalError:
+            logger.exception("Failed to write %d render events", len(batch) - index)
+            _hold(batch[index:])
+            break
+        except Exception:
+            logger.exception("Dropped render event for %r", access_log.endpoint)
+        else:
+            written += 1
+    return written
+
+
+def _hold(rows) -> None:
+    """Keep rows for the next flush unless they are out of attempts."""
+    global _retry
+    kept = []
+    for access_log in rows:
+        _reset(access_log)
+        access_log._requeues = getattr(access_log, '_requeues', 0) + 1
+        if access_log._requeues <= settings.ACCESS_LOG_MAX_REQUEUES:
+            kept.append(access_log)
+    _retry = kept[:settings.ACCESS_LOG_MAX_PENDING]
+    if len(_retry) < len(rows):
+        logger.warning(
+            "Dropped %d render events after repeated write failures",
+            len(rows) - len(_retry),
+        )
+
+
+def _reset(access_log) -> None:
+    """Undo what a failed write left on an unsaved row."""
+    access_log.pk = None
+    access_log.document = None
+    access_log.is_first_access = False
+
+
+def _link_documents(batch) -> None:
+    """
+    Attach documents to a batch of render events, creating unknown CIDs.
+
+    The first queued event of a document that has never been logged is
+    flagged as its first access. Runs inside the insert's transaction, so
+    a failed insert leaves first_logged unset. CIDs longer than the column
+    are blanked by _build_access_log and never reach this point.
+    """
+    from ..models import Document
+
+    cids = {access_log.cid for access_log in batch if access_log.cid}
+    if not cids:
+        return
+
+    documents = Document.objects.only('id', 'cid', 'first_logged')
+    by_cid = documents.in_bulk(cids, field_name='cid')
+    missing = cids.difference(by_cid)
+    if missing:
+        Document.objects.bulk_create(
+            [Document(cid=cid) for cid in missing],
+            ignore_conflicts=True,
+        )
+        by_cid.update(documents.in_bulk(missing, field_name='cid'))
+        # Only once the new documents are committed
+        transaction.on_commit(lambda: remember_cids(missing))
+
+    first_logged = {
+        cid for cid, document in by_cid.items()
+        if not document.first_logged and Document.mark_first_logged(document.pk)
+    }
+
+    for access_log in batch:
+        if not access_log.cid:
+            continue
+        access_log.document = by_cid.get(access_log.cid)
+        if access_log.cid in first_logged:
+            access_log.is_first_access = True
+            first_logged.discard(access_log.cid)
+
+
+def _run() -> None:
+    while True:
+        _wake.wait(settings.ACCESS_LOG_FLUSH_INTERVAL)
+        _wake.clear()
+        try:
+            flush()
+        except Exception:
+            # A dead flusher would leave every later event stuck in the queue
+            logger.exception("Render event flush failed")
+
+
+def _ensure_worker() -> None:
+    """Start the flusher thread on first use (after any worker fork)."""
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(
+                target=_run, name='access-log-flusher', daemon=True
+            )
+            _worker.start()
+            atexit.register(flush)
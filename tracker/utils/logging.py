@@ -3,80 +3,156 @@ Logging service for tracking document access.
 Uses stealth terminology throughout.
 """
 import datetime
+import ipaddress
+from django.db import models
 from django.utils import timezone
 from typing import Optional
-from ..models import Document, AccessLog
-from .fingerprint import extract_request_metadata, extract_query_params
+from ..models import AccessLog
+from . import log_buffer
+from .fingerprint import extract_cid, extract_request_metadata, extract_query_params
 
 
-def log_access(
+# (attname, max_length) of every string column; max_length is None for text
+_STRING_FIELDS = tuple(
+    (field.attname, field.max_length)
+    for field in AccessLog._meta.concrete_fields
+    if isinstance(field, (models.CharField, models.TextField))
+)
+_JSON_FIELDS = tuple(
+    field.attname
+    for field in AccessLog._meta.concrete_fields
+    if isinstance(field, models.JSONField)
+)
+
+
+def _build_access_log(
     request,
     endpoint: str,
     cid: Optional[str] = None,
     request_body: Optional[dict] = None,
-    timestamp: Optional[datetime.datetime] = None
+    timestamp: Optional[datetime.datetime] = None,
+    metadata_defaults: Optional[dict] = None
 ) -> AccessLog:
     """
-    Log a document render event.
-    
-    Args:
-        request: Django HttpRequest object
-        endpoint: The endpoint path being accessed
-        cid: Optional CID extracted from query params
-        request_body: Optional request body for POST requests
-        timestamp: Optional timestamp of the event (defaults to now)
-    
-    Returns:
-        AccessLog instance
+    Build an unsaved AccessLog for a request.
+
+    Client-supplied values are coerced to what their columns accept, since
+    a single rejected row would otherwise fail the whole batch insert.
+    metadata_defaults fills metadata fields the request itself left empty.
     """
     # Extract metadata
     metadata = extract_request_metadata(request)
     query_params = extract_query_params(request)
+    for field, value in (metadata_defaults or {}).items():
+        if value and not metadata.get(field):
+            metadata[field] = value
     
     # Get CID from query params if not provided
     if not cid:
-        cid = query_params.get('cid', query_params.get('c', ''))
+        cid = extract_cid(request) or ''
     
-    # Link to document if CID exists
-    document = None
-    is_first_access = False
-    if cid:
-        document = Document.get_or_create_by_cid(cid)
-        is_first_access = not document.access_logs.exists()
-    
-    # Create access log
-    access_log = AccessLog.objects.create(
-        document=document,
+    # The document link and first-access flag are resolved by the log buffer
+    access_log = AccessLog(
         cid=cid,
         endpoint=endpoint,
         method=request.method,
         query_params=query_params,
         request_body=request_body or {},
-        is_first_access=is_first_access,
         timestamp=timestamp or timezone.now(),
         **metadata
     )
+    _clean_fields(access_log)
+    return access_log
+
+
+def _clean_fields(access_log: AccessLog) -> None:
+    """Make string columns fit their limits and drop what PostgreSQL rejects."""
+    for attname, max_length in _STRING_FIELDS:
+        value = getattr(access_log, attname)
+        if not isinstance(value, str):
+            value = '' if value is None else str(value)
+        if '\x00' in value:
+            value = value.replace('\x00', '')
+        if max_length and len(value) > max_length:
+            # A truncated CID would name a different document; keep the
+            # original in query_params only
+            value = '' if attname == 'cid' else value[:max_length]
+        setattr(access_log, attname, value)
+
+    for attname in _JSON_FIELDS:
+        setattr(access_log, attname, _strip_nul(getattr(access_log, attname)))
+
+    if access_log.ip_address:
+        try:
+            ipaddress.ip_address(access_log.ip_address)
+        except ValueError:
+            # e.g. "X-Forwarded-For: unknown", which an inet column rejects
+            access_log.ip_address = None
+
+
+def _strip_nul(value):
+    """Drop NUL characters from JSON data; jsonb rejects \\u0000."""
+    if isinstance(value, str):
+        return value.replace('\x00', '') if '\x00' in value else value
+    if isinstance(value, dict):
+        return {_strip_nul(key): _strip_nul(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_strip_nul(item) for item in value]
+    return value
+
+
+def log_access(
+    request,
+    endpoint: str,
+    cid: Optional[str] = None,
+    request_body: Optional[dict] = None,
+    timestamp: Optional[datetime.datetime] = None
+) -> AccessLog:
+    """
+    Log a document render event.
+    
+    The event is queued and written in a batch by the log buffer, which
+    also links the document and sets is_first_access. The request itself
+    makes no database queries here, and the returned instance is not saved
+    yet.
     
+    Args:
+        request: Django HttpRequest object
+        endpoint: The endpoint path being accessed
+        cid: Optional CID extracted from query params
+        request_body: Optional request body for POST requests
+        timestamp: Optional timestamp of the event (defaults to now)
+    
+    Returns:
+        Unsaved AccessLog instance
+    """
+    access_log = _build_access_log(
+        request,
+        endpoint,
+        cid=cid,
+        request_body=request_body,
+        timestamp=timestamp
+    )
+    log_buffer.enqueue(access_log)
     return access_log
 
 
 def log_telemetry(request, endpoint: str, payload: dict) -> AccessLog:
     """Log telemetry/client signal events."""
-    # Extract client info from payload
-    client_app = payload.get('client', '')
-    client_build = payload.get('build', '')
+    # Client info from the payload only fills what the User-Agent left empty
+    metadata_defaults = {}
+    if isinstance(payload, dict):
+        for field, key in (('client_app', 'client'), ('client_build', 'build')):
+            value = payload.get(key)
+            if isinstance(value, str):
+                metadata_defaults[field] = value
     
-    access_log = log_access(
+    access_log = _build_access_log(
         request=request,
         endpoint=endpoint,
-        request_body=payload
+        request_body=payload,
+        metadata_defaults=metadata_defaults
     )
-    
-    # Update with payload-specific data
-    if client_app and not access_log.client_app:
-        access_log.client_app = client_app
-    if client_build and not access_log.client_build:
-        access_log.client_build = client_build
-    access_log.save()
+    log_buffer.enqueue(access_log)
     
     return access_log
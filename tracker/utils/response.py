@@ -1,23 +1,53 @@
 """
 Response utilities for generating stealth content.
 """
-import base64
-from django.http import HttpResponse
+import functools
+import hashlib
+from typing import Optional, Tuple, Union
 
+import orjson
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
 
-# 1x1 transparent PNG (smallest valid PNG)
-TRANSPARENT_PNG_BASE64 = (
-    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
+# 1x1 transparent PNG (smallest valid PNG), stored as a literal so the
+# bytes live in the .pyc instead of being decoded at import.
+# Base64: iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==
+TRANSPARENT_PNG_BYTES = (
+    b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89'
+    b'\x00\x00\x00\rIDATx\xdacd\xf8\xcfP\x0f\x00\x03\x86\x01\x80Z4}k'
+    b'\x00\x00\x00\x00IEND\xaeB`\x82'
 )
 
-TRANSPARENT_PNG_BYTES = base64.b64decode(TRANSPARENT_PNG_BASE64)
 
-# Minimal valid WOFF2 (empty font placeholder)
-MINIMAL_WOFF2_BASE64 = (
-    "d09GMgABAAAAAADcAA4AAAAAATQAAADNAAEAAAAAAAAAAAAAAAAAAAAAAAAAAAAAP0ZGVE0cGh4GYACCahEICgAL"
-    "EAABNgIkAwgEBgWDJAcgGwHwBhxk7xsv5aeSF3j+v0/n5P3/n5lZd3eZmZm7u8zM"
+
+def make_etag(content: bytes) -> str:
+    """Return a strong ETag for a fixed response body."""
+    return '"%s"' % hashlib.md5(content, usedforsecurity=False).hexdigest()
+
+
+TRANSPARENT_PNG_ETAG = make_etag(TRANSPARENT_PNG_BYTES)
+
+_PNG_RESPONSE_HEADERS = {
+    'Cache-Control': 'public, max-age=31536000, immutable',
+    'ETag': TRANSPARENT_PNG_ETAG,
+    'Content-Length': str(len(TRANSPARENT_PNG_BYTES)),
+}
+
+# Minimal valid WOFF2 header (empty font)
+MINIMAL_WOFF2 = (
+    b'\x77\x4F\x46\x32\x00\x01\x00\x00'
+    b'\x00\x00\x00\x1C\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00'
 )
 
+_FONT_RESPONSE_HEADERS = {
+    'Cache-Control': 'public, max-age=31536000, immutable',
+    'ETag': make_etag(MINIMAL_WOFF2),
+    'Content-Length': str(len(MINIMAL_WOFF2)),
+}
+
 # Standard config responses
 CONFIG_RUNTIME = {
     "theme": "light",
@@ -42,32 +72,117 @@ CONFIG_DOC_SETTINGS = {
     "render_mode": "standard",
 }
 
+# Health and telemetry responses
+STATUS_OK = {"status": "ok"}
+
+STATUS_READY = {"status": "ready", "healthy": True}
+
+PREFETCH_CONFIG = {
+    "preload": [],
+    "cache": True,
+    "ttl": 3600,
+}
+
+# Config and status responses never change, so serialize them once
+CONFIG_RUNTIME_JSON = orjson.dumps(CONFIG_RUNTIME)
+CONFIG_UI_FLAGS_JSON = orjson.dumps(CONFIG_UI_FLAGS)
+CONFIG_DOC_SETTINGS_JSON = orjson.dumps(CONFIG_DOC_SETTINGS)
+STATUS_OK_JSON = orjson.dumps(STATUS_OK)
+STATUS_READY_JSON = orjson.dumps(STATUS_READY)
+PREFETCH_CONFIG_JSON = orjson.dumps(PREFETCH_CONFIG)
+
+CONFIG_RUNTIME_ETAG = make_etag(CONFIG_RUNTIME_JSON)
+CONFIG_UI_FLAGS_ETAG = make_etag(CONFIG_UI_FLAGS_JSON)
+CONFIG_DOC_SETTINGS_ETAG = make_etag(CONFIG_DOC_SETTINGS_JSON)
+
 
-def get_transparent_png_response() -> HttpResponse:
+def etag_matches(request, etag: str) -> bool:
+    """Return True if the request's If-None-Match covers ``etag``."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return '*' in etags or etag in etags or 'W/' + etag in etags
+
+
+def get_head_response(
+    content_type: str,
+    content_length: int,
+    headers: Optional[dict] = None,
+) -> HttpResponse:
+    """Return a body-less HEAD response describing the body a GET would get."""
+    return HttpResponse(
+        content_type=content_type,
+        headers={**(headers or {}), 'Content-Length': str(content_length)},
+    )
+
+
+def _conditional_response(request, body: bytes, content_type: str, headers: dict) -> HttpResponse:
+    """
+    Return a fixed body with its precomputed headers, ETag and Content-Length
+    included. Given the request, a matching If-None-Match gets a 304 and a
+    HEAD request gets the headers without the body.
+    """
+    if request is not None:
+        if etag_matches(request, headers['ETag']):
+            return HttpResponseNotModified(
+                headers={k: v for k, v in headers.items() if k != 'Content-Length'}
+            )
+        if request.method == 'HEAD':
+            # Content-Length still describes the GET body
+            return HttpResponse(content_type=content_type, headers=headers)
+    return HttpResponse(body, content_type=content_type, headers=headers)
+
+
+def get_transparent_png_response(request=None) -> HttpResponse:
     """Return a 1x1 transparent PNG response."""
-    response = HttpResponse(
-        TRANSPARENT_PNG_BYTES,
-        content_type='image/png'
+    return _conditional_response(
+        request, TRANSPARENT_PNG_BYTES, 'image/png', _PNG_RESPONSE_HEADERS
     )
-    response['Cache-Control'] = 'public, max-age=31536000'
-    response['Content-Length'] = len(TRANSPARENT_PNG_BYTES)
-    return response
 
 
-def get_minimal_css_response(theme_name: str = 'default') -> HttpResponse:
-    """Return minimal valid CSS."""
-    css_content = f"/* {theme_name} theme */\n:root {{ --theme: {theme_name}; }}\n"
-    response = HttpResponse(css_content, content_type='text/css')
-    response['Cache-Control'] = 'public, max-age=86400'
-    return response
-
-
-def get_json_response(data: dict, cache_seconds: int = 300) -> HttpResponse:
-    """Return a JSON response with proper headers."""
-    import json
-    response = HttpResponse(
-        json.dumps(data),
-        content_type='application/json'
+def get_font_response(request=None) -> HttpResponse:
+    """Return a placeholder WOFF2 font response."""
+    return _conditional_response(
+        request, MINIMAL_WOFF2, 'font/woff2', _FONT_RESPONSE_HEADERS
     )
-    response['Cache-Control'] = f'public, max-age={cache_seconds}'
-    return response
+
+
+@functools.lru_cache(maxsize=128)
+def _minimal_css(theme_name: str) -> Tuple[bytes, dict]:
+    """CSS body and headers for a theme. Shared by the cache, never mutate."""
+    css_content = f"/* {theme_name} theme */\n:root {{ --theme: {theme_name}; }}\n".encode()
+    headers = {
+        'Cache-Control': 'public, max-age=31536000, immutable',
+        'ETag': make_etag(css_content),
+        'Content-Length': str(len(css_content)),
+    }
+    return css_content, headers
+
+
+def get_minimal_css_response(theme_name: str = 'default', request=None) -> HttpResponse:
+    """Return minimal valid CSS."""
+    css_content, headers = _minimal_css(theme_name)
+    return _conditional_response(request, css_content, 'text/css', headers)
+
+
+def get_json_response(
+    data: Union[dict, bytes],
+    cache_seconds: int = 300,
+    request=None,
+    etag: Optional[str] = None,
+) -> HttpResponse:
+    """
+    Return a JSON response with proper headers. Accepts pre-serialized bytes.
+    With an etag, a request whose If-None-Match matches gets a 304. Given
+    the request, HEAD gets the headers without the body.
+    """
+    body = data if isinstance(data, bytes) else orjson.dumps(data)
+    headers = {'Cache-Control': f'public, max-age={cache_seconds}'}
+    if etag:
+        headers['ETag'] = etag
+        if request is not None and etag_matches(request, etag):
+            return HttpResponseNotModified(headers=headers)
+    if request is not None and request.method == 'HEAD':
+        return get_head_response('application/json', len(body), headers)
+    return HttpResponse(body, content_type='application/json', headers=headers)
@@ -0,0 +1,13 @@
+"""
+OpenAPI schema helpers.
+Lets deployments skip drf-spectacular's view annotations entirely.
+"""
+from django.conf import settings
+from drf_spectacular.utils import extend_schema as _extend_schema
+
+
+def extend_schema(*args, **kwargs):
+    """drf-spectacular's extend_schema, or a no-op when GENERATE_SCHEMA is off."""
+    if not settings.GENERATE_SCHEMA:
+        return lambda view: view
+    return _extend_schema(*args, **kwargs)
@@ -2,17 +2,57 @@
 """
 API endpoints for document management and tracking.
 """
-import jwt
 import datetime
-import json
+
+import orjson
 from django.conf import settings
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import api_view
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, OpenApiExample
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, OpenApiExample
 
 from ..models import Document
+from ..utils.cid_cache import is_known_cid, remember_cids
 from ..utils.logging import log_access
+from ..utils.schema import extend_schema
+
+
+def _json_response(data: dict, status: int = 200) -> HttpResponse:
+    """Return an uncached JSON response serialized with orjson."""
+    return HttpResponse(orjson.dumps(data), content_type='application/json', status=status)
+
+
+def _save_documents(docs: dict) -> None:
+    """
+    Insert new documents and update changed ones, keyed by cid.
+    Re-registering a document with the same details writes nothing.
+    """
+    existing = Document.objects.only('id', 'cid', 'name', 'file_path').in_bulk(
+        docs.keys(), field_name='cid'
+    )
+
+    new, changed = [], []
+    for cid, doc in docs.items():
+        current = existing.get(cid)
+        if current is None:
+            new.append(doc)
+        elif (current.name, current.file_path) != (doc.name, doc.file_path):
+            current.name = doc.name
+            current.file_path = doc.file_path
+            changed.append(current)
+
+    if new:
+        # Upsert so a concurrent registration of the same cid can't fail us
+        Document.objects.bulk_create(
+            new,
+            update_conflicts=True,
+            unique_fields=['cid'],
+            update_fields=['name', 'file_path'],
+            batch_size=1000,
+        )
+    if changed:
+        Document.objects.bulk_update(changed, ['name', 'file_path'], batch_size=1000)
+
 
 @extend_schema(
     operation_id="create_document",
@@ -60,44 +100,40 @@ def create_document(request):
     Payload: uuid, file_path, document_name, created_at (as object or list of objects)
     """
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         
-        if isinstance(data, list):
-            items = data
-        else:
-            items = [data]
-            
-        processed_ids = []
-        for item in items:
-            resource_id = item.get('uuid')
-            file_path = item.get('file_path', '')
-            name = item.get('document_name', '')
-            
-            if not resource_id:
-                continue
-
-            doc, created = Document.objects.update_or_create(
-                cid=resource_id,
-                defaults={
-                    'name': name,
-                    'file_path': file_path,
-                }
+        items = data if isinstance(data, list) else [data]
+        # CIDs are strings in the database and the cache
+        uuids = [(str(item['uuid']), item) for item in items if item.get('uuid')]
+        processed_ids = [cid for cid, _ in uuids]
+
+        # Repeated uuids collapse to their last occurrence
+        docs = {
+            cid: Document(
+                cid=cid,
+                name=item.get('document_name', ''),
+                file_path=item.get('file_path', ''),
             )
-            processed_ids.append(doc.cid)
+            for cid, item in uuids
+        }
+        if docs:
+            _save_documents(docs)
         
+        remember_cids(processed_ids)
+
         if not processed_ids and items:
-            return JsonResponse({"error": "uuid is required for at least one item"}, status=400)
+            return _json_response({"error": "uuid is required for at least one item"}, status=400)
 
         # Return single id for backward compatibility if only one item was sent as object
         if not isinstance(data, list) and len(processed_ids) == 1:
-            return JsonResponse({"status": "ok", "resource_id": processed_ids[0]})
+            return _json_response({"status": "ok", "resource_id": processed_ids[0]})
             
-        return JsonResponse({"status": "ok", "resource_ids": processed_ids})
+        return _json_response({"status": "ok", "resource_ids": processed_ids})
         
-    except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    except orjson.JSONDecodeError:
+        return _json_response({"error": "Invalid JSON"}, status=400)
     except Exception as e:
-        return JsonResponse({"error": str(e)}, status=500)
+        return _json_response({"error": str(e)}, status=500)
 
 
 @extend_schema(
@@ -127,7 +163,7 @@ def beacon(request):
         return JsonResponse({"error": "resource_id is required"}, status=400)
 
     # Validate document exists
-    if not Document.objects.filter(cid=resource_id).exists():
+    if not is_known_cid(resource_id):
         return JsonResponse({"error": "Document not found"}, status=404)
 
     try:
@@ -2,16 +2,26 @@
 Dashboard views for the tracking system.
 Uses stealth terminology: "Document Assets", "Render Events", "Client Signals".
 """
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from urllib.parse import urlencode
+
 from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse
-from django.db.models import Count, Q
-from django.db.models.functions import TruncDate, TruncHour
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, TruncDate, TruncHour
 from django.utils import timezone
-from datetime import timedelta
+from django.views.decorators.cache import cache_page
+from datetime import datetime, timedelta
 
 from ..models import Document, AccessLog
 
 
+# Aggregate pages tolerate a minute of staleness; this keeps repeat
+# visits and chart refreshes from re-running every GROUP BY.
+CACHE_SECONDS = 60
+
+
+@cache_page(CACHE_SECONDS)
 def index(request):
     """Main dashboard with overview statistics."""
     # Get time ranges
@@ -22,15 +32,36 @@ def index(request):
 
     # Overall stats
     total_documents = Document.objects.count()
-    total_events = AccessLog.objects.count()
-    events_24h = AccessLog.objects.filter(timestamp__gte=last_24h).count()
-    events_7d = AccessLog.objects.filter(timestamp__gte=last_7d).count()
 
-    # Unique IPs
-    unique_ips = AccessLog.objects.values('ip_address').distinct().count()
-    unique_ips_24h = AccessLog.objects.filter(
-        timestamp__gte=last_24h
-    ).values('ip_address').distinct().count()
+    # Event counts, unique IPs and device categories in a single query
+    office_q = (
+        Q(client_app__contains='Office')
+        | Q(client_app__contains='Word')
+        | Q(client_app__contains='Excel')
+    )
+    mobile_q = (
+        Q(user_agent__contains='Android')
+        | Q(user_agent__contains='iPhone')
+        | Q(user_agent__contains='iPad')
+        | Q(user_agent__contains='Mobile')
+    )
+    stats = AccessLog.objects.aggregate(
+        total_events=Count('id'),
+        events_24h=Count('id', filter=Q(timestamp__gte=last_24h)),
+        events_7d=Count('id', filter=Q(timestamp__gte=last_7d)),
+        unique_ips=Count('ip_address', distinct=True),
+        unique_ips_24h=Count(
+            'ip_address', distinct=True, filter=Q(timestamp__gte=last_24h)
+        ),
+        mobile=Count('id', filter=~office_q & mobile_q),
+        desktop=Count('id', filter=~office_q & ~mobile_q),
+        office=Count('id', filter=office_q),
+    )
+    device_stats = {
+        'mobile': stats['mobile'],
+        'desktop': stats['desktop'],
+        'office': stats['office'],
+    }
 
     # Top accessed documents
     top_documents = Document.objects.annotate(
@@ -38,7 +69,7 @@ def index(request):
     ).order_by('-event_count')[:10]
 
     # Recent events
-    recent_events = AccessLog.objects.select_related('document').order_by('-timestamp')[:20]
+    recent_events = AccessLog.objects.order_by('-timestamp')[:20]
 
     # Events by endpoint
     events_by_endpoint = AccessLog.objects.values('endpoint').annotate(
@@ -69,39 +100,18 @@ def index(request):
     ).order_by('hour')
 
     # Advanced Stats
-    # 1. Device Category (Desktop vs Mobile)
-    mobile_keywords = ['Android', 'iPhone', 'iPad', 'Mobile']
-    device_stats = {
-        'mobile': 0,
-        'desktop': 0,
-        'office': 0
-    }
-    
-    # Analyze detailed user agents for categories
-    all_uas = AccessLog.objects.values('user_agent', 'client_app')
-    for ua in all_uas:
-        ua_str = ua['user_agent']
-        client = ua['client_app']
-        
-        if 'Office' in client or 'Word' in client or 'Excel' in client:
-            device_stats['office'] += 1
-        elif any(k in ua_str for k in mobile_keywords):
-            device_stats['mobile'] += 1
-        else:
-            device_stats['desktop'] += 1
-
-    # 2. Top ISPs (Corporate Identification)
+    # Top ISPs (Corporate Identification)
     top_isps = AccessLog.objects.exclude(isp='').values('isp').annotate(
         count=Count('id')
     ).order_by('-count')[:5]
 
     context = {
         'total_documents': total_documents,
-        'total_events': total_events,
-        'events_24h': events_24h,
-        'events_7d': events_7d,
-        'unique_ips': unique_ips,
-        'unique_ips_24h': unique_ips_24h,
+        'total_events': stats['total_events'],
+        'events_24h': stats['events_24h'],
+        'events_7d': stats['events_7d'],
+        'unique_ips': stats['unique_ips'],
+        'unique_ips_24h': stats['unique_ips_24h'],
         'top_documents': top_documents,
         'recent_events': recent_events,
         'events_by_endpoint': events_by_endpoint,
@@ -114,53 +124,82 @@ def index(request):
     return render(request, 'dashboard/index.html', context)
 
 
+# Events list query parameter -> AccessLog lookup
+EVENT_FILTER_LOOKUPS = {
+    'cid': 'cid__icontains',
+    'ip': 'ip_address__icontains',
+    'endpoint': 'endpoint__icontains',
+    'country': 'country__icontains',
+    'client': 'client_app__icontains',
+}
+
+
+def _encode_cursor(event):
+    """Encode an event's (timestamp, id) position as a pagination cursor."""
+    raw = f'{event.timestamp.isoformat()}|{event.pk}'
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    """Return (timestamp, id) for a pagination cursor, or None if malformed."""
+    try:
+        timestamp, pk = urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(timestamp), int(pk)
+    except ValueError:
+        return None
+
+
 def events_list(request):
     """List all render events with filtering."""
     # Get filter parameters
-    cid = request.GET.get('cid', '')
-    ip = request.GET.get('ip', '')
-    endpoint = request.GET.get('endpoint', '')
-    country = request.GET.get('country', '')
-    client = request.GET.get('client', '')
-    first_access = request.GET.get('first_access', '')
-
-    # Build queryset
-    events = AccessLog.objects.select_related('document').order_by('-timestamp')
-
-    if cid:
-        events = events.filter(cid__icontains=cid)
-    if ip:
-        events = events.filter(ip_address__icontains=ip)
-    if endpoint:
-        events = events.filter(endpoint__icontains=endpoint)
-    if country:
-        events = events.filter(country__icontains=country)
-    if client:
-        events = events.filter(client_app__icontains=client)
-    if first_access == 'true':
-        events = events.filter(is_first_access=True)
-
-    # Pagination
-    page = int(request.GET.get('page', 1))
+    filters = {
+        param: request.GET.get(param, '')
+        for param in (*EVENT_FILTER_LOOKUPS, 'first_access')
+    }
+
+    # Build queryset with a single filter() call
+    lookups = {
+        lookup: filters[param]
+        for param, lookup in EVENT_FILTER_LOOKUPS.items() if filters[param]
+    }
+    if filters['first_access'] == 'true':
+        lookups['is_first_access'] = True
+    events = AccessLog.objects.filter(**lookups)
+
+    # Keyset pagination on (-timestamp, -id): "cursor" pages to older
+    # events, "before" pages back to newer ones. No COUNT or OFFSET, so
+    # deep pages cost the same as the first.
     per_page = 50
-    total = events.count()
-    events = events[(page-1)*per_page:page*per_page]
+    after = _decode_cursor(request.GET.get('cursor', ''))
+    before = _decode_cursor(request.GET.get('before', ''))
+
+    if before:
+        timestamp, pk = before
+        rows = list(events.filter(
+            Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=pk)
+        ).order_by('timestamp', 'id')[:per_page + 1])
+        has_newer = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_older = True
+    else:
+        if after:
+            timestamp, pk = after
+            events = events.filter(
+                Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk)
+            )
+        rows = list(events.order_by('-timestamp', '-id')[:per_page + 1])
+        has_older = len(rows) > per_page
+        rows = rows[:per_page]
+        has_newer = after is not None
 
     context = {
-        'events': events,
-        'filters': {
-            'cid': cid,
-            'ip': ip,
-            'endpoint': endpoint,
-            'country': country,
-            'client': client,
-            'first_access': first_access,
-        },
+        'events': rows,
+        'filters': filters,
         'pagination': {
-            'page': page,
             'per_page': per_page,
-            'total': total,
-            'total_pages': (total + per_page - 1) // per_page,
+            'next_cursor': _encode_cursor(rows[-1]) if rows and has_older else '',
+            'prev_cursor': _encode_cursor(rows[0]) if rows and has_newer else '',
+            'filter_query': urlencode({k: v for k, v in filters.items() if v}),
         }
     }
     return render(request, 'dashboard/events.html', context)
@@ -192,12 +231,16 @@ def event_detail(request, event_id):
     return render(request, 'dashboard/event_detail.html', context)
 
 
+@cache_page(CACHE_SECONDS)
 def documents_list(request):
     """List all tracked documents."""
+    # Per-document subqueries run off the (document, -timestamp) index
+    # instead of joining every log row and grouping by all Document columns
+    logs = AccessLog.objects.filter(document=OuterRef('pk')).order_by().values('document')
     documents = Document.objects.annotate(
-        event_count=Count('access_logs'),
-        first_access=Min('access_logs__timestamp'),
-        last_access=Max('access_logs__timestamp'),
+        event_count=Coalesce(Subquery(logs.annotate(n=Count('id')).values('n')), 0),
+        first_access=Subquery(logs.annotate(ts=Min('timestamp')).values('ts')),
+        last_access=Subquery(logs.annotate(ts=Max('timestamp')).values('ts')),
     ).order_by('-event_count')
 
     context = {
@@ -206,6 +249,7 @@ def documents_list(request):
     return render(request, 'dashboard/documents.html', context)
 
 
+@cache_page(CACHE_SECONDS)
 def document_detail(request, doc_id):
     """View full details of a document."""
     document = get_object_or_404(Document, id=doc_id)
@@ -228,6 +272,7 @@ def document_detail(request, doc_id):
 
 
 # API endpoints for dashboard charts
+@cache_page(CACHE_SECONDS)
 def api_hourly_activity(request):
     """Get hourly activity for charts."""
     hours = int(request.GET.get('hours', 24))
@@ -247,6 +292,7 @@ def api_hourly_activity(request):
     })
 
 
+@cache_page(CACHE_SECONDS)
 def api_events_by_endpoint(request):
     """Get events grouped by endpoint."""
     data = AccessLog.objects.values('endpoint').annotate(
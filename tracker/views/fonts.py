@@ -3,35 +3,15 @@ Font and theme endpoints.
 Looks like: Web font loading, theme CSS.
 Reality: Document access tracking (rarely blocked by firewalls).
 """
-from django.http import HttpResponse, Http404
-from rest_framework.decorators import api_view
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
+from django.http import Http404
+from django.views.decorators.http import require_http_methods
 
-from ..models import Document
-from ..utils.response import get_minimal_css_response
+from ..utils.cid_cache import is_known_cid
+from ..utils.response import get_font_response, get_minimal_css_response
 from ..utils.logging import log_access
 
 
-# Minimal valid WOFF2 header (empty font)
-MINIMAL_WOFF2 = bytes([
-    0x77, 0x4F, 0x46, 0x32, 0x00, 0x01, 0x00, 0x00,
-    0x00, 0x00, 0x00, 0x1C, 0x00, 0x00, 0x00, 0x00,
-    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
-    0x00, 0x00, 0x00, 0x00
-])
-
-
-@extend_schema(
-    operation_id="get_font_file",
-    summary="Retrieve web font",
-    description="Serves web font files (WOFF/WOFF2 format).",
-    parameters=[
-        OpenApiParameter(name="resource_id", description="Document UUID/CID", required=False, type=str),
-    ],
-    responses={200: OpenApiResponse(description="Font file (WOFF2)")},
-    tags=["Fonts & Themes"],
-)
-@api_view(["GET", "HEAD"])
+@require_http_methods(["GET", "HEAD"])
 def font_file(request, fontname):
     """
     Serve a 'font file'.
@@ -39,41 +19,24 @@ def font_file(request, fontname):
     URL: /fonts/<fontname>.woff2
     Example: /fonts/inter-regular.woff2
     """
-    resource_id = request.GET.get('resource_id')
+    if not fontname.endswith(('.woff', '.woff2')):
+        raise Http404
 
-    # Validate if resource_id is provided and valid
-    if resource_id and not Document.objects.filter(cid=resource_id).exists():
-        # Invalid resource_id
-        # We could return 404, or just skip logging.
-        # Following consistent behavior with assets:
-        pass
+    resource_id = request.GET.get('resource_id')
 
-    if resource_id and Document.objects.filter(cid=resource_id).exists():
+    # Only log render events for registered documents; HEAD probes
+    # are not render events
+    if request.method != 'HEAD' and resource_id and is_known_cid(resource_id):
         log_access(
             request=request,
             endpoint=f'/fonts/{fontname}',
             cid=resource_id
         )
     
-    response = HttpResponse(
-        MINIMAL_WOFF2,
-        content_type='font/woff2'
-    )
-    response['Cache-Control'] = 'public, max-age=31536000'
-    return response
+    return get_font_response(request)
 
 
-@extend_schema(
-    operation_id="get_theme_file",
-    summary="Retrieve theme CSS",
-    description="Serves theme CSS files.",
-    parameters=[
-        OpenApiParameter(name="resource_id", description="Document UUID/CID", required=False, type=str),
-    ],
-    responses={200: OpenApiResponse(description="CSS file")},
-    tags=["Fonts & Themes"],
-)
-@api_view(["GET", "HEAD"])
+@require_http_methods(["GET", "HEAD"])
 def theme_file(request, themename):
     """
     Serve a 'theme CSS file'.
@@ -81,13 +44,16 @@ def theme_file(request, themename):
     URL: /themes/<themename>.css
     Example: /themes/default.css
     """
+    if not themename.endswith('.css'):
+        raise Http404
+
     resource_id = request.GET.get('resource_id')
 
-    if resource_id and Document.objects.filter(cid=resource_id).exists():
+    if request.method != 'HEAD' and resource_id and is_known_cid(resource_id):
         log_access(
             request=request,
             endpoint=f'/themes/{themename}',
             cid=resource_id
         )
     
-    return get_minimal_css_response(themename.replace('.css', ''))
+    return get_minimal_css_response(themename[:-len('.css')], request)
@@ -3,100 +3,71 @@ Health and prefetch endpoints.
 Looks like: Load balancer checks, SPA warmups.
 Reality: Background noise tracking.
 """
-from django.http import HttpResponse, JsonResponse
-from rest_framework.decorators import api_view
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, OpenApiExample
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control, never_cache
+from django.views.decorators.http import require_http_methods
 
+from ..utils.fingerprint import extract_cid
 from ..utils.logging import log_access
+from ..utils.response import PREFETCH_CONFIG_JSON, STATUS_READY_JSON, get_head_response
 
 
-@extend_schema(
-    operation_id="health_ping",
-    summary="Health check ping",
-    description="Simple health check endpoint returning 'ok'.",
-    parameters=[
-        OpenApiParameter(name="cid", description="Client ID", required=False, type=str),
-    ],
-    responses={200: OpenApiResponse(description="Plain text 'ok'")},
-    tags=["Health"],
-)
-@api_view(["GET", "HEAD"])
+@never_cache
+@require_http_methods(["GET", "HEAD"])
 def ping(request):
     """
     Health check ping.
     
     URL: /health/ping
     """
+    # Monitors probe with HEAD; only GETs are logged
+    if request.method == 'HEAD':
+        return get_head_response('text/plain', len(b'ok'))
+
     log_access(
         request=request,
         endpoint='/health/ping',
-        cid=request.GET.get('cid', request.GET.get('c'))
+        cid=extract_cid(request)
     )
     
     return HttpResponse("ok", content_type='text/plain')
 
 
-@extend_schema(
-    operation_id="status_ready",
-    summary="Readiness check",
-    description="Returns service readiness status.",
-    parameters=[
-        OpenApiParameter(name="cid", description="Client ID", required=False, type=str),
-    ],
-    responses={
-        200: OpenApiResponse(
-            description="Readiness status",
-            examples=[OpenApiExample("Ready", value={"status": "ready", "healthy": True})]
-        )
-    },
-    tags=["Health"],
-)
-@api_view(["GET", "HEAD"])
+@never_cache
+@require_http_methods(["GET", "HEAD"])
 def ready(request):
     """
     Readiness check.
     
     URL: /status/ready
     """
+    if request.method == 'HEAD':
+        return get_head_response('application/json', len(STATUS_READY_JSON))
+
     log_access(
         request=request,
         endpoint='/status/ready',
-        cid=request.GET.get('cid', request.GET.get('c'))
+        cid=extract_cid(request)
     )
     
-    return JsonResponse({"status": "ready", "healthy": True})
+    return HttpResponse(STATUS_READY_JSON, content_type='application/json')
 
 
-@extend_schema(
-    operation_id="prefetch_init",
-    summary="Prefetch initialization",
-    description="Returns prefetch configuration for client caching.",
-    parameters=[
-        OpenApiParameter(name="cid", description="Client ID", required=False, type=str),
-    ],
-    responses={
-        200: OpenApiResponse(
-            description="Prefetch config",
-            examples=[OpenApiExample("Config", value={"preload": [], "cache": True, "ttl": 3600})]
-        )
-    },
-    tags=["Health"],
-)
-@api_view(["GET", "HEAD"])
+@cache_control(max_age=60)
+@require_http_methods(["GET", "HEAD"])
 def prefetch_init(request):
     """
     Prefetch initialization.
     
     URL: /prefetch/init
     """
+    if request.method == 'HEAD':
+        return get_head_response('application/json', len(PREFETCH_CONFIG_JSON))
+
     log_access(
         request=request,
         endpoint='/prefetch/init',
-        cid=request.GET.get('cid', request.GET.get('c'))
+        cid=extract_cid(request)
     )
     
-    return JsonResponse({
-        "preload": [],
-        "cache": True,
-        "ttl": 3600
-    })
+    return HttpResponse(PREFETCH_CONFIG_JSON, content_type='application/json')
@@ -3,138 +3,59 @@ Telemetry endpoints.
 Looks like: Performance metrics, usage analytics, error reporting.
 Reality: Client signal capture with intelligence extraction.
 """
-import json
-from django.http import JsonResponse
-from rest_framework.decorators import api_view
-from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
+import orjson
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 
 from ..utils.logging import log_telemetry
+from ..utils.response import STATUS_OK_JSON
 
 
-@extend_schema(
-    operation_id="post_telemetry_metrics",
-    summary="Submit performance metrics",
-    description="Accepts performance metrics data from clients.",
-    request={
-        "application/json": {
-            "type": "object",
-            "properties": {
-                "event": {"type": "string", "description": "Event type"},
-                "ts": {"type": "integer", "description": "Timestamp"},
-                "duration": {"type": "number", "description": "Duration in ms"},
-            }
-        }
-    },
-    responses={
-        200: OpenApiResponse(
-            description="Success",
-            examples=[OpenApiExample("Success", value={"status": "ok"})]
-        )
-    },
-    tags=["Telemetry"],
-)
-@api_view(["POST"])
-def metrics(request):
-    """
-    Accept performance metrics.
-    
-    URL: POST /telemetry/metrics
-    """
+def _handle_telemetry(request, endpoint: str) -> HttpResponse:
+    """Log a telemetry POST; malformed bodies are logged as an empty payload."""
     try:
-        payload = json.loads(request.body) if request.body else {}
-    except json.JSONDecodeError:
+        payload = orjson.loads(request.body) if request.body else {}
+    except orjson.JSONDecodeError:
         payload = {}
     
     log_telemetry(
         request=request,
-        endpoint='/telemetry/metrics',
+        endpoint=endpoint,
         payload=payload
     )
     
-    return JsonResponse({"status": "ok"})
+    return HttpResponse(STATUS_OK_JSON, content_type='application/json')
 
 
-@extend_schema(
-    operation_id="post_telemetry_client",
-    summary="Submit client information",
-    description="Accepts client information and environment details.",
-    request={
-        "application/json": {
-            "type": "object",
-            "properties": {
-                "client": {"type": "string", "description": "Client application name"},
-                "build": {"type": "string", "description": "Build version"},
-                "platform": {"type": "string", "description": "Platform/OS"},
-            }
-        }
-    },
-    responses={
-        200: OpenApiResponse(
-            description="Success",
-            examples=[OpenApiExample("Success", value={"status": "ok"})]
-        )
-    },
-    tags=["Telemetry"],
-)
-@api_view(["POST"])
+@csrf_exempt
+@require_POST
+def metrics(request):
+    """
+    Accept performance metrics.
+    
+    URL: POST /telemetry/metrics
+    """
+    return _handle_telemetry(request, '/telemetry/metrics')
+
+
+@csrf_exempt
+@require_POST
 def client_info(request):
     """
     Accept client information.
     
     URL: POST /telemetry/client
     """
-    try:
-        payload = json.loads(request.body) if request.body else {}
-    except json.JSONDecodeError:
-        payload = {}
-    
-    log_telemetry(
-        request=request,
-        endpoint='/telemetry/client',
-        payload=payload
-    )
-    
-    return JsonResponse({"status": "ok"})
+    return _handle_telemetry(request, '/telemetry/client')
 
 
-@extend_schema(
-    operation_id="post_telemetry_events",
-    summary="Submit event data",
-    description="Accepts event data for analytics.",
-    request={
-        "application/json": {
-            "type": "object",
-            "properties": {
-                "event": {"type": "string", "description": "Event name"},
-                "ts": {"type": "integer", "description": "Timestamp"},
-                "data": {"type": "object", "description": "Event data"},
-            }
-        }
-    },
-    responses={
-        200: OpenApiResponse(
-            description="Success",
-            examples=[OpenApiExample("Success", value={"status": "ok"})]
-        )
-    },
-    tags=["Telemetry"],
-)
-@api_view(["POST"])
+@csrf_exempt
+@require_POST
 def events(request):
     """
     Accept event data.
     
     URL: POST /telemetry/events
     """
-    try:
-        payload = json.loads(request.body) if request.body else {}
-    except json.JSONDecodeError:
-        payload = {}
-    
-    log_telemetry(
-        request=request,
-        endpoint='/telemetry/events',
-        payload=payload
-    )
-    
-    return JsonResponse({"status": "ok"})
+    return _handle_telemetry(request, '/telemetry/events')